@@ -5,6 +5,7 @@ All sounds are Creative Commons licensed and free to use.
 """
 
 import os
+import shutil
 import urllib.request
 import urllib.parse
 
@@ -25,9 +26,10 @@ def download_sound(url, filename, description=""):
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
         
+        # Stream in 64KB chunks rather than buffering the whole file
         with urllib.request.urlopen(req) as response:
             with open(filepath, 'wb') as f:
-                f.write(response.read())
+                shutil.copyfileobj(response, f, 64 * 1024)
         
         print(f"✅ Downloaded successfully: {filename}")
         return True
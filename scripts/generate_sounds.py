@@ -10,93 +10,145 @@ import numpy as np
 import wave
 import math
 import os
+import hashlib
+from functools import lru_cache
+
+@lru_cache(maxsize=8)
+def _time_base(frames, sample_rate):
+    """Return a shared, read-only array of sample times in seconds."""
+    # Kept in float64: phase error from a float32 time base grows with
+    # duration, so only the final sin/exp results are narrowed to float32
+    t = np.arange(frames) / sample_rate
+    t.setflags(write=False)
+    return t
+
+def _sine(frequency, frames, sample_rate):
+    """Return sin(2*pi*frequency*t) for frames samples."""
+    return np.sin(2 * math.pi * frequency * _time_base(frames, sample_rate)).astype(np.float32)
+
+def _envelope(frames, attack_frames, release_frames):
+    """Return a linear attack/sustain/release envelope of length frames."""
+    attack_frames = min(attack_frames, frames)
+    release_frames = min(release_frames, frames - attack_frames)
+    sustain_frames = frames - attack_frames - release_frames
+    return np.concatenate([
+        np.linspace(0, 1, attack_frames, endpoint=False, dtype=np.float32),
+        np.ones(sustain_frames, dtype=np.float32),
+        np.linspace(1, 0, release_frames, endpoint=False, dtype=np.float32),
+    ])
+
+def _fade_envelope(frames, sample_rate):
+    """Return a gentle fade in/out envelope to avoid clicks."""
+    fade_frames = int(0.1 * sample_rate)  # 100ms fade
+    return _envelope(frames, fade_frames, fade_frames)
 
 def generate_sine_wave(frequency, duration, sample_rate=44100, amplitude=0.5):
     """Generate a sine wave with the given frequency and duration."""
     frames = int(duration * sample_rate)
-    arr = []
-    for i in range(frames):
-        # Generate sine wave
-        value = amplitude * math.sin(2 * math.pi * frequency * i / sample_rate)
-        # Apply gentle fade in/out to avoid clicks
-        fade_frames = int(0.1 * sample_rate)  # 100ms fade
-        if i < fade_frames:
-            value *= i / fade_frames
-        elif i > frames - fade_frames:
-            value *= (frames - i) / fade_frames
-        arr.append(value)
-    return np.array(arr)
+    return amplitude * _sine(frequency, frames, sample_rate) * _fade_envelope(frames, sample_rate)
 
 def generate_chord(frequencies, duration, sample_rate=44100, amplitude=0.3):
     """Generate a chord by combining multiple frequencies."""
-    waves = []
-    for freq in frequencies:
-        wave = generate_sine_wave(freq, duration, sample_rate, amplitude)
-        waves.append(wave)
-    
-    # Combine waves
-    combined = np.sum(waves, axis=0)
+    frames = int(duration * sample_rate)
+    t = _time_base(frames, sample_rate)
+
+    # Combine waves with one (frequencies x frames) broadcast
+    freqs = np.asarray(frequencies, dtype=np.float64)[:, None]
+    combined = amplitude * np.sin(2 * math.pi * freqs * t).sum(axis=0).astype(np.float32)
     # Normalize to prevent clipping
-    combined = combined / len(frequencies)
-    return combined
+    combined /= len(frequencies)
+    return combined * _fade_envelope(frames, sample_rate)
 
 def save_wav(filename, audio_data, sample_rate=44100):
     """Save audio data as WAV file."""
-    # Convert to 16-bit integers
-    audio_data = np.int16(audio_data * 32767)
-    
+    # Convert to 16-bit integers, scaling a private float32 copy in place
+    # so the caller's buffer is never modified
+    pcm = np.array(audio_data, dtype=np.float32)
+    np.clip(pcm, -1.0, 1.0, out=pcm)
+    np.multiply(pcm, 32767, out=pcm)
+    pcm = pcm.astype(np.int16, copy=False)
+
     with wave.open(filename, 'w') as wav_file:
         wav_file.setnchannels(1)  # Mono
         wav_file.setsampwidth(2)  # 16-bit
         wav_file.setframerate(sample_rate)
-        wav_file.writeframes(audio_data.tobytes())
+        # Declare the length up front so the header never needs patching,
+        # and hand wave the array buffer directly instead of a bytes copy
+        wav_file.setnframes(len(pcm))
+        wav_file.writeframesraw(memoryview(pcm))
 
-def create_pomodoro_complete():
-    """Create a simple, quiet bell sound for pomodoro completion."""
-    # Simple bell tone - much quieter and simpler
-    fundamental = 800  # Higher pitch bell sound
-    
-    # Create a simple bell with natural decay
-    duration = 1.5  # Shorter duration
-    sample_rate = 44100
+def generate_bell(frequency, duration, amplitude, decay, fade, sample_rate=44100):
+    """Generate a sine bell with exponential decay and a short fade in."""
     frames = int(duration * sample_rate)
-    
-    bell_sound = []
-    for i in range(frames):
-        # Simple sine wave with exponential decay
-        t = i / sample_rate
-        decay = math.exp(-t * 2)  # Exponential decay
-        amplitude = 0.15 * decay  # Much quieter (was 0.4)
-        
-        # Simple sine wave
-        value = amplitude * math.sin(2 * math.pi * fundamental * t)
-        
-        # Gentle fade in for first 10ms to avoid click
-        fade_frames = int(0.01 * sample_rate)
-        if i < fade_frames:
-            value *= i / fade_frames
-            
-        bell_sound.append(value)
-    
-    return np.array(bell_sound)
+    # Gentle fade in to avoid click
+    fade_frames = int(fade * sample_rate)
 
-def create_break_complete():
-    """Create a simple, soft tone for break completion."""
-    # Single soft tone instead of chord - much simpler
-    frequency = 523.25  # C5
-    
-    # Create a simple tone with gentle envelope
-    duration = 1.0  # Shorter
-    tone_sound = generate_sine_wave(frequency, duration, amplitude=0.12)  # Much quieter
-    
-    return tone_sound
+    # Simple sine wave with exponential decay
+    t = _time_base(frames, sample_rate)
+    bell_sound = amplitude * _sine(frequency, frames, sample_rate)
+    bell_sound *= np.exp(-t * decay).astype(np.float32)
+    bell_sound *= _envelope(frames, fade_frames, 0)
 
-def create_session_start():
-    """Create a very quiet notification for session start."""
-    # Simple single soft tone
-    tone = generate_sine_wave(660, 0.5, amplitude=0.08)  # E5, very quiet
-    
-    return tone
+    return bell_sound
+
+# Bump when a change to the synthesis code alters generated output, so
+# previously generated files are regenerated
+GENERATOR_VERSION = 1
+
+# Every generated sound, keyed by output file name (without extension)
+SOUND_SPECS = {
+    # Simple, quiet bell for pomodoro completion
+    'pomodoro_complete': {
+        'kind': 'bell',
+        'frequency': 800,  # Higher pitch bell sound
+        'duration': 1.5,
+        'amplitude': 0.15,  # Much quieter (was 0.4)
+        'decay': 2,  # Exponential decay rate
+        'fade': 0.01,  # 10ms fade in
+    },
+    # Single soft tone for break completion
+    'break_complete': {
+        'kind': 'tone',
+        'frequency': 523.25,  # C5
+        'duration': 1.0,
+        'amplitude': 0.12,
+    },
+    # Very quiet notification for session start
+    'session_start': {
+        'kind': 'tone',
+        'frequency': 660,  # E5
+        'duration': 0.5,
+        'amplitude': 0.08,
+    },
+}
+
+def synthesize(spec, sample_rate=44100):
+    """Render a SOUND_SPECS entry to a normalized float buffer."""
+    params = {k: v for k, v in spec.items() if k != 'kind'}
+    if spec['kind'] == 'bell':
+        return generate_bell(sample_rate=sample_rate, **params)
+    if spec['kind'] == 'tone':
+        return generate_sine_wave(sample_rate=sample_rate, **params)
+    raise ValueError(f"unknown sound kind: {spec['kind']}")
+
+def generation_key(spec, sample_rate=44100):
+    """Return a digest of everything that determines a generated sound."""
+    params = (GENERATOR_VERSION, sample_rate, sorted(spec.items()))
+    return hashlib.blake2b(repr(params).encode()).hexdigest()
+
+def up_to_date(path, key):
+    """Check whether path exists and was generated with the given key."""
+    try:
+        with open(path + '.hash') as f:
+            return os.path.exists(path) and f.read().strip() == key
+    except OSError:
+        return False
+
+def generate_sound(path, spec, key):
+    """Synthesize and save a sound, recording the key it was generated with."""
+    save_wav(path, synthesize(spec))
+    with open(path + '.hash', 'w') as f:
+        f.write(key)
 
 def main():
     """Generate all sound files."""
@@ -105,20 +157,19 @@ def main():
     
     print("Generating copyright-free notification sounds...")
     
-    # Generate pomodoro completion sound
-    print("Creating pomodoro completion sound...")
-    pomodoro_sound = create_pomodoro_complete()
-    save_wav(os.path.join(sounds_dir, 'pomodoro_complete.wav'), pomodoro_sound)
-    
-    # Generate break completion sound
-    print("Creating break completion sound...")
-    break_sound = create_break_complete()
-    save_wav(os.path.join(sounds_dir, 'break_complete.wav'), break_sound)
-    
-    # Generate session start sound
-    print("Creating session start sound...")
-    start_sound = create_session_start()
-    save_wav(os.path.join(sounds_dir, 'session_start.wav'), start_sound)
+    # Check the cache up front so up-to-date sounds cost nothing
+    stale = []
+    for name, spec in SOUND_SPECS.items():
+        path = os.path.join(sounds_dir, name + '.wav')
+        key = generation_key(spec)
+        if up_to_date(path, key):
+            print(f"{name}.wav is up to date, skipping")
+        else:
+            print(f"Creating {name}.wav...")
+            stale.append((path, spec, key))
+
+    for path, spec, key in stale:
+        generate_sound(path, spec, key)
     
     print(f"Sound files generated in: {sounds_dir}")
     print("All sounds are copyright-free and safe for distribution.")